@@ -3,9 +3,13 @@ Database Helper Functions
 
 MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
+
+The client is Motor's AsyncIOMotorClient, so every helper is a coroutine and
+must be awaited. Call `connect()` from the app's startup event so the client
+is bound to the running event loop; `db` stays None until then.
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
@@ -21,12 +25,38 @@ db = None
 database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
-if database_url and database_name:
-    _client = MongoClient(database_url)
+# Connection pool sizing, per uvicorn worker process
+max_pool_size = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+min_pool_size = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+
+
+def connect():
+    """Create the Motor client on the running loop (idempotent)"""
+    global _client, db
+    if db is not None or not (database_url and database_name):
+        return db
+    _client = AsyncIOMotorClient(
+        database_url,
+        maxPoolSize=max_pool_size,
+        minPoolSize=min_pool_size,
+        serverSelectionTimeoutMS=3000,
+        socketTimeoutMS=5000,
+    )
     db = _client[database_name]
+    return db
+
+
+def close():
+    """Close the Motor client"""
+    global _client, db
+    if _client is not None:
+        _client.close()
+    _client = None
+    db = None
+
 
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -40,16 +70,16 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await db[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
     """Get documents from collection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
-    
+
     cursor = db[collection_name].find(filter_dict or {})
     if limit:
         cursor = cursor.limit(limit)
-    
-    return list(cursor)
+
+    return await cursor.to_list(length=limit)
@@ -1,59 +1,130 @@
 import os
-import io
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+import logging
+import tempfile
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import List, Optional, Dict, Any, Tuple
+
+import numpy as np
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse, ORJSONResponse
 
 from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
 
-from database import db, create_document, get_documents
+import database
+from database import create_document, get_documents
 from schemas import (
     WaitlistEntry, ContactMessage, AssessmentSubmission,
     CareerMatch, Roadmap, CareerTemplate, User
 )
 
-# Optional Google Sheets integration
-GSPREAD_AVAILABLE = False
-try:
-    import gspread  # type: ignore
-    from google.oauth2.service_account import Credentials  # type: ignore
-    GSPREAD_AVAILABLE = True
-except Exception:
-    GSPREAD_AVAILABLE = False
-
-# Optional PDF generation (ReportLab)
-REPORTLAB_AVAILABLE = False
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.units import cm
-    REPORTLAB_AVAILABLE = True
-except Exception:
-    REPORTLAB_AVAILABLE = False
-
-app = FastAPI(title="Pathify AI Backend")
+
+app = FastAPI(title="Pathify AI Backend", default_response_class=ORJSONResponse)
+
+# Explicit allowlist (comma-separated CORS_ORIGINS); browsers cache preflights for a day
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "https://pathify.ai").split(",") if o.strip()]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,
 )
 
+# Dashboard and template JSON is key-heavy and compresses well
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
+logger = logging.getLogger(__name__)
+
+
+# Authorized spreadsheet handles are refreshed at most once per TTL;
+# a failed load is retried after the much shorter retry interval
+SHEETS_TTL_SECONDS = int(os.getenv("SHEETS_TTL_SECONDS", "3600"))
+SHEETS_RETRY_SECONDS = int(os.getenv("SHEETS_RETRY_SECONDS", "30"))
+app.state.sh = None
+app.state.ws_by_title = {}
+app.state.sheets_loaded_at = 0.0
+
+# Sheet rows are buffered and written with one append_rows call per batch
+SHEETS_BATCH_SIZE = int(os.getenv("SHEETS_BATCH_SIZE", "50"))
+SHEETS_FLUSH_SECONDS = float(os.getenv("SHEETS_FLUSH_SECONDS", "5"))
+# Rows beyond this are dropped (and logged) rather than buffered without limit
+SHEETS_QUEUE_MAX = int(os.getenv("SHEETS_QUEUE_MAX", "1000"))
+# How long shutdown waits for the final flush before giving up on it
+SHEETS_SHUTDOWN_SECONDS = float(os.getenv("SHEETS_SHUTDOWN_SECONDS", "30"))
+# Queued at shutdown: the flush loop writes its pending batch and exits
+FLUSH_STOP = object()
+
+
+@app.on_event("startup")
+async def startup():
+    # Bind the Motor client to the running event loop and open the pool
+    db = database.connect()
+    if db is not None:
+        try:
+            await db.command("ping")
+        except Exception:
+            pass
+        for collection, key in (("waitlistentry", "email"), ("careertemplate", "career")):
+            try:
+                await db[collection].create_index(key, unique=True)
+            except Exception:
+                pass
+    # Created per lifespan so it belongs to the running loop; only orders background reloads
+    app.state.sheets_lock = asyncio.Lock()
+    await cached_sheets(force=True)
+    # Queues are created here so they belong to the loop serving this lifespan
+    app.state.waitlist_queue = asyncio.Queue(maxsize=SHEETS_QUEUE_MAX)
+    app.state.contact_queue = asyncio.Queue(maxsize=SHEETS_QUEUE_MAX)
+    app.state.flush_tasks = [
+        asyncio.create_task(flush_loop(app.state.waitlist_queue, waitlist_worksheet)),
+        asyncio.create_task(flush_loop(app.state.contact_queue, contact_worksheet)),
+    ]
+    for task in app.state.flush_tasks:
+        task.add_done_callback(_log_flush_exit)
+    app.state.pdf_semaphore = asyncio.Semaphore(PDF_CONCURRENCY)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Stop the flush loops after they have written everything queued so far
+    for queue in (app.state.waitlist_queue, app.state.contact_queue):
+        try:
+            queue.put_nowait(FLUSH_STOP)
+        except asyncio.QueueFull:
+            pass
+    _, pending = await asyncio.wait(app.state.flush_tasks, timeout=SHEETS_SHUTDOWN_SECONDS)
+    for task in pending:
+        logger.warning("Sheets flush did not finish within %ss, cancelling", SHEETS_SHUTDOWN_SECONDS)
+        task.cancel()
+    database.close()
+
 
 # ----------------------------- Helpers -----------------------------
 
 def sheets_client():
-    if not GSPREAD_AVAILABLE:
-        return None
     service_json = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON")
     sheet_id = os.getenv("GOOGLE_SHEET_ID")
     if not service_json or not sheet_id:
         return None
+    # Optional Google Sheets integration, imported only once it is configured
+    try:
+        import gspread  # type: ignore
+        from google.oauth2.service_account import Credentials  # type: ignore
+    except Exception:
+        return None
     try:
         import json
         info = json.loads(service_json)
@@ -69,41 +140,150 @@ def sheets_client():
         return None
 
 
-def append_waitlist_to_sheet(entry: WaitlistEntry) -> bool:
+def sheets_configured() -> bool:
+    """Cheap check for request handlers; loading is left to the flush loops"""
+    return bool(os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON") and os.getenv("GOOGLE_SHEET_ID"))
+
+
+def load_sheets():
+    """Authorize once and index the worksheets by title"""
     sh = sheets_client()
     if not sh:
+        return None, {}
+    try:
+        return sh, {w.title: w for w in sh.worksheets()}
+    except Exception:
+        return sh, {}
+
+
+def _sheets_stale() -> bool:
+    ttl = SHEETS_TTL_SECONDS if app.state.sh is not None else SHEETS_RETRY_SECONDS
+    return time.monotonic() - app.state.sheets_loaded_at > ttl
+
+
+async def cached_sheets(force: bool = False):
+    """Return the cached Spreadsheet handle, reloading it once the TTL expires"""
+    if force or _sheets_stale():
+        # One reload at a time; requests queued behind it reuse its result
+        async with app.state.sheets_lock:
+            if force or _sheets_stale():
+                app.state.sh, app.state.ws_by_title = await run_in_threadpool(load_sheets)
+                app.state.sheets_loaded_at = time.monotonic()
+    return app.state.sh
+
+
+def waitlist_worksheet(sh):
+    # First tab, same as sh.sheet1 but without the extra metadata read
+    return next(iter(app.state.ws_by_title.values()), None) or sh.sheet1
+
+
+def contact_worksheet(sh):
+    ws = app.state.ws_by_title.get("Contact")
+    if ws is None:
+        try:
+            ws = sh.add_worksheet("Contact", 100, 10)
+        except Exception:
+            # Another worker created the tab after our index was loaded
+            ws = sh.worksheet("Contact")
+        app.state.ws_by_title["Contact"] = ws
+    return ws
+
+
+async def flush_rows(rows: List[List[str]], worksheet_for) -> bool:
+    if not rows:
+        return True
+    sh = await cached_sheets()
+    if not sh:
+        logger.warning("Sheets unavailable, dropped %d row(s)", len(rows))
         return False
     try:
-        ws = sh.sheet1
-        ws.append_row([
-            entry.name,
-            entry.email,
-            entry.instagram or "",
-            entry.source or "website",
-            datetime.utcnow().isoformat()
-        ])
+        ws = await run_in_threadpool(worksheet_for, sh)
+        await run_in_threadpool(ws.append_rows, rows, value_input_option="RAW")
         return True
     except Exception:
+        logger.exception("Sheets append_rows failed, dropped %d row(s)", len(rows))
+        return False
+
+
+def _log_flush_exit(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Sheets flush loop died; queued rows will not be written", exc_info=task.exception())
+
+
+def enqueue_row(queue: asyncio.Queue, row: List[str]) -> bool:
+    try:
+        queue.put_nowait(row)
+        return True
+    except asyncio.QueueFull:
+        logger.warning("Sheets queue full, dropped 1 row")
         return False
 
 
+async def flush_loop(queue: asyncio.Queue, worksheet_for):
+    """Collect up to SHEETS_BATCH_SIZE rows or SHEETS_FLUSH_SECONDS, then write them"""
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        first = await queue.get()
+        if first is FLUSH_STOP:
+            return
+        rows = [first]
+        deadline = loop.time() + SHEETS_FLUSH_SECONDS
+        while len(rows) < SHEETS_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                row = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if row is FLUSH_STOP:
+                stopping = True
+                break
+            rows.append(row)
+        await flush_rows(rows, worksheet_for)
+
+
+_now_iso_cache: List[Any] = [0, ""]
+
+
+def _now_iso() -> str:
+    """UTC timestamp for sheet rows, rebuilt at most once per second"""
+    t = int(time.time())
+    if t != _now_iso_cache[0]:
+        _now_iso_cache[:] = [t, datetime.fromtimestamp(t, timezone.utc).replace(tzinfo=None).isoformat()]
+    return _now_iso_cache[1]
+
+
+def waitlist_row(entry: WaitlistEntry) -> List[str]:
+    return [
+        entry.name,
+        entry.email,
+        entry.instagram or "",
+        entry.source or "website",
+        _now_iso()
+    ]
+
+
 # ----------------------------- Routes -----------------------------
 
 @app.get("/")
-def root():
+async def root():
     return {"app": "Pathify AI Backend", "status": "ok"}
 
 
 @app.get("/test")
-def test_database():
+async def test_database():
+    db = database.db
+    sh = app.state.sh
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available" if db is None else "✅ Connected",
-        "sheets": "✅ Enabled" if sheets_client() else "❌ Not Configured",
+        "sheets": "✅ Enabled" if sh else "❌ Not Configured",
     }
     try:
-        if db:
-            response["collections"] = db.list_collection_names()
+        if db is not None:
+            response["collections"] = await db.list_collection_names()
     except Exception as e:
         response["database"] = f"⚠️ {str(e)[:80]}"
     return response
@@ -111,32 +291,41 @@ def test_database():
 
 # ---- Waitlist ----
 @app.post("/api/waitlist")
-def add_waitlist(entry: WaitlistEntry):
-    doc_id = create_document("waitlistentry", entry)
-    appended = append_waitlist_to_sheet(entry)
+async def add_waitlist(entry: WaitlistEntry):
+    try:
+        doc_id = await create_document("waitlistentry", entry)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Email already on the waitlist")
+    # Rows are queued without touching Sheets; flush_rows reloads the handle if needed
+    appended = sheets_configured()
+    if appended:
+        appended = enqueue_row(app.state.waitlist_queue, waitlist_row(entry))
     return {"id": doc_id, "sheet": appended}
 
 
 @app.get("/api/waitlist/stats")
-def waitlist_stats():
-    items = get_documents("waitlistentry", {}, limit=50)
-    total = db["waitlistentry"].count_documents({}) if db else len(items)
-    names = [i.get("name") for i in items][-10:][::-1]
+async def waitlist_stats():
+    db = database.db
+    if db is None:
+        raise HTTPException(status_code=503, detail="Database not available")
+    # Newest 10 names only; the total comes from collection metadata
+    cursor = db["waitlistentry"].find({}, {"name": 1, "_id": 0}).sort("_id", -1).limit(10)
+    names = [d.get("name") for d in await cursor.to_list(length=10)]
+    total = await db["waitlistentry"].estimated_document_count()
     return {"total": total, "recent": names}
 
 
 # ---- Contact ----
+def contact_row(msg: ContactMessage) -> List[str]:
+    return [msg.name, msg.email, msg.message, _now_iso()]
+
+
 @app.post("/api/contact")
-def contact(msg: ContactMessage):
-    doc_id = create_document("contactmessage", msg)
+async def contact(msg: ContactMessage):
+    doc_id = await create_document("contactmessage", msg)
     # Optional: also send to Google Sheets second tab
-    sh = sheets_client()
-    if sh:
-        try:
-            ws = sh.worksheet("Contact") if "Contact" in [w.title for w in sh.worksheets()] else sh.add_worksheet("Contact", 100, 10)
-            ws.append_row([msg.name, msg.email, msg.message, datetime.utcnow().isoformat()])
-        except Exception:
-            pass
+    if sheets_configured():
+        enqueue_row(app.state.contact_queue, contact_row(msg))
     return {"id": doc_id}
 
 
@@ -147,194 +336,382 @@ class AssessmentResult(BaseModel):
     preview_summary: Dict[str, Any]
 
 
-CAREER_LIBRARY: Dict[str, Dict[str, Any]] = {
-    "Software Engineer": {
-        "skills": ["Data Structures", "Algorithms", "Python", "Git", "System Design"],
-        "why": ["Strong analytical thinking", "Enjoys building things", "High demand across industries"],
-    },
-    "Data Scientist": {
-        "skills": ["Statistics", "Python", "Pandas", "Machine Learning", "Visualization"],
-        "why": ["Enjoys working with data", "Curiosity for patterns", "Growing AI ecosystem"],
-    },
-    "UI/UX Designer": {
-        "skills": ["Figma", "User Research", "Prototyping", "Visual Design", "Accessibility"],
-        "why": ["Creative problem solving", "Empathy for users", "Portfolio-driven growth"],
-    },
-    "Cybersecurity Analyst": {
-        "skills": ["Network Basics", "Linux", "Threat Modeling", "SIEM", "Security+"],
-        "why": ["Detail-oriented", "Protective mindset", "Rising threats -> demand"],
-    },
-    "Product Manager": {
-        "skills": ["Communication", "Roadmapping", "User Stories", "Analytics", "Leadership"],
-        "why": ["Cross-functional", "User + business focus", "High leverage role"],
-    },
+@dataclass(frozen=True, slots=True)
+class CareerSpec:
+    name: str
+    skills: Tuple[str, ...]
+    # Casefolded, aligned with skills so skill gaps keep the display names
+    skills_lower: Tuple[str, ...]
+    why: Tuple[str, ...]
+
+    @classmethod
+    def build(cls, name: str, skills: List[str], why: List[str]) -> "CareerSpec":
+        return cls(name, tuple(skills), tuple(s.casefold() for s in skills), tuple(why))
+
+
+CAREER_LIBRARY: Dict[str, CareerSpec] = {spec.name: spec for spec in (
+    CareerSpec.build(
+        "Software Engineer",
+        ["Data Structures", "Algorithms", "Python", "Git", "System Design"],
+        ["Strong analytical thinking", "Enjoys building things", "High demand across industries"],
+    ),
+    CareerSpec.build(
+        "Data Scientist",
+        ["Statistics", "Python", "Pandas", "Machine Learning", "Visualization"],
+        ["Enjoys working with data", "Curiosity for patterns", "Growing AI ecosystem"],
+    ),
+    CareerSpec.build(
+        "UI/UX Designer",
+        ["Figma", "User Research", "Prototyping", "Visual Design", "Accessibility"],
+        ["Creative problem solving", "Empathy for users", "Portfolio-driven growth"],
+    ),
+    CareerSpec.build(
+        "Cybersecurity Analyst",
+        ["Network Basics", "Linux", "Threat Modeling", "SIEM", "Security+"],
+        ["Detail-oriented", "Protective mindset", "Rising threats -> demand"],
+    ),
+    CareerSpec.build(
+        "Product Manager",
+        ["Communication", "Roadmapping", "User Stories", "Analytics", "Leadership"],
+        ["Cross-functional", "User + business focus", "High leverage role"],
+    ),
+)}
+
+# Shared figures attached to every match; never mutated after import
+SALARY_FORECAST = {"entry": 4.0, "mid": 12.0, "senior": 30.0}  # LPA example
+DEMAND_TREND_6M = "+12%"
+DEMAND_REGIONS = ("India", "US", "Remote")
+
+
+# Interest tags that boost a career; any one matching tag applies the boost once
+INTEREST_BOOSTS: Dict[str, Any] = {
+    "Software Engineer": (("code", "programming", "software"), 25),
+    "UI/UX Designer": (("design",), 22),
+    "Data Scientist": (("data", "math"), 24),
+    "Cybersecurity Analyst": (("security", "network"), 20),
+    "Product Manager": (("lead", "business"), 18),
 }
 
+# Precomputed at import: M[career, skill_id] over the casefolded skill vocabulary
+CAREER_NAMES: List[str] = list(CAREER_LIBRARY)
+SKILL_VOCAB: Dict[str, int] = {}
+for _spec in CAREER_LIBRARY.values():
+    for _s in _spec.skills_lower:
+        SKILL_VOCAB.setdefault(_s, len(SKILL_VOCAB))
+SKILL_MATRIX = np.zeros((len(CAREER_NAMES), len(SKILL_VOCAB)), dtype=np.uint8)
+for _i, _career in enumerate(CAREER_NAMES):
+    SKILL_MATRIX[_i, [SKILL_VOCAB[s] for s in CAREER_LIBRARY[_career].skills_lower]] = 1
+
+INTEREST_VOCAB: Dict[str, int] = {}
+for _tags, _ in INTEREST_BOOSTS.values():
+    for _t in _tags:
+        INTEREST_VOCAB.setdefault(_t, len(INTEREST_VOCAB))
+INTEREST_MATRIX = np.zeros((len(CAREER_NAMES), len(INTEREST_VOCAB)), dtype=np.uint8)
+INTEREST_BOOST = np.zeros(len(CAREER_NAMES), dtype=np.float64)
+for _i, _career in enumerate(CAREER_NAMES):
+    _tags, _boost = INTEREST_BOOSTS.get(_career, ((), 0))
+    INTEREST_MATRIX[_i, [INTEREST_VOCAB[t] for t in _tags]] = 1
+    INTEREST_BOOST[_i] = _boost
+
+# Score = sum_k w_k * c_k over criteria normalized to [0, 1] (personality to [-1, 1]);
+# each weight is the most points that criterion can add
+CRITERIA = ("baseline", "interest", "skills", "personality")
+CRITERIA_WEIGHTS = np.array([50.0, 25.0, 18.0, 8.0])
+SKILL_POINTS_PER_MATCH = 6
+# Static part of C[career, k]: the baseline, and each career's share of the interest weight
+CRITERIA_STATIC = np.zeros((len(CAREER_NAMES), len(CRITERIA)))
+CRITERIA_STATIC[:, 0] = 1.0
+INTEREST_SCALE = INTEREST_BOOST / CRITERIA_WEIGHTS[1]
+
+
+def encode(values, vocab: Dict[str, int]) -> np.ndarray:
+    vec = np.zeros(len(vocab), dtype=np.uint8)
+    for v in values:
+        idx = vocab.get(v)
+        if idx is not None:
+            vec[idx] = 1
+    return vec
+
+
+def build_criteria(payload: AssessmentSubmission) -> np.ndarray:
+    """Per-request criteria matrix c[career, k], aligned with CRITERIA"""
+    c = CRITERIA_STATIC.copy()
+
+    # interest-based boosts
+    interest_hits = (INTEREST_MATRIX @ encode(payload.interests, INTEREST_VOCAB)) > 0
+    c[:, 1] = interest_hits * INTEREST_SCALE
+
+    # skills overlap
+    overlaps = SKILL_MATRIX @ encode(payload.skills, SKILL_VOCAB)
+    c[:, 2] = np.minimum(overlaps * SKILL_POINTS_PER_MATCH, CRITERIA_WEIGHTS[2]) / CRITERIA_WEIGHTS[2]
+
+    # personality tilt, the same for every career
+    # Bounded to 10–15 answers of 1–5 by AssessmentSubmission, so int8 is safe
+    personality = float(np.asarray(payload.personality_answers, dtype=np.int8).mean())
+    c[:, 3] = int((personality - 3) * 4) / CRITERIA_WEIGHTS[3]  # -8..+8 approx
+    return c
+
+
+TOP_MATCHES = 5
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k best scores, best first; ties keep library order"""
+    n = len(scores)
+    # Fold the index into the key so ties resolve like a stable descending sort
+    key = scores.astype(np.int64) * n - np.arange(n)
+    if k < n:
+        idx = np.argpartition(-key, k - 1)[:k]
+    else:
+        idx = np.arange(n)
+    return idx[np.argsort(-key[idx])]
 
-def score_careers(payload: AssessmentSubmission) -> List[CareerMatch]:
-    # Simple heuristic for demo purposes
-    interests = set([s.lower() for s in payload.interests])
-    skills = set([s.lower() for s in payload.skills])
-    personality = sum(payload.personality_answers) / max(len(payload.personality_answers), 1)
-
-    results: List[CareerMatch] = []
-    for career, meta in CAREER_LIBRARY.items():
-        base = 50
-        # interest-based boosts
-        if "code" in interests or "programming" in interests or "software" in interests:
-            if career == "Software Engineer":
-                base += 25
-        if "design" in interests:
-            if career == "UI/UX Designer":
-                base += 22
-        if "data" in interests or "math" in interests:
-            if career == "Data Scientist":
-                base += 24
-        if "security" in interests or "network" in interests:
-            if career == "Cybersecurity Analyst":
-                base += 20
-        if "lead" in interests or "business" in interests:
-            if career == "Product Manager":
-                base += 18
-
-        # skills overlap
-        overlap = len(set([s.lower() for s in meta["skills"]]).intersection(skills))
-        base += min(overlap * 6, 18)
-
-        # personality tilt
-        base += int((personality - 3) * 4)  # -8..+8 approx
-        base = max(1, min(97, base))
-
-        # build outputs
-        gap = [s for s in meta["skills"] if s.lower() not in skills]
-        salary = {"entry": 4.0, "mid": 12.0, "senior": 30.0}  # LPA example
-        demand = {"current_index": base, "trend_6m": "+12%", "regions": ["India", "US", "Remote"]}
 
-        match = CareerMatch(
-            career=career,
-            match_percent=base,
-            why_match=meta["why"],
-            strengths=list(skills)[:5],
-            skill_gap=gap,
-            salary_forecast=salary,
-            demand_trends=demand,
-        )
-        results.append(match)
+def score_careers(payload: AssessmentSubmission) -> List[Dict[str, Any]]:
+    """Top matches as plain dicts shaped like CareerMatch"""
+    # Simple heuristic for demo purposes
+    # interests/skills arrive casefolded from AssessmentSubmission
+    skills = frozenset(payload.skills)
+    strengths = list(dict.fromkeys(payload.skills))[:5]
 
-    results.sort(key=lambda m: m.match_percent, reverse=True)
-    return results[:5]
+    base = np.rint(build_criteria(payload) @ CRITERIA_WEIGHTS).clip(1, 97).astype(int)
 
+    results: List[Dict[str, Any]] = []
+    for i in top_k(base, TOP_MATCHES):
+        career = CAREER_NAMES[i]
+        spec = CAREER_LIBRARY[career]
+        score = int(base[i])
 
-@app.post("/api/assessment", response_model=AssessmentResult)
-def run_assessment(payload: AssessmentSubmission):
+        # build outputs
+        gap = [s for s, low in zip(spec.skills, spec.skills_lower) if low not in skills]
+        demand = {"current_index": score, "trend_6m": DEMAND_TREND_6M, "regions": DEMAND_REGIONS}
+
+        results.append({
+            "career": career,
+            "match_percent": score,
+            "why_match": spec.why,
+            "strengths": strengths,
+            "skill_gap": gap,
+            "salary_forecast": SALARY_FORECAST,
+            "demand_trends": demand,
+        })
+
+    return results
+
+
+# Built server-side from validated data, so encoded directly with orjson (no
+# response-model validation or jsonable_encoder pass); the model only documents it
+@app.post("/api/assessment", response_model=None, responses={200: {"model": AssessmentResult}})
+async def run_assessment(payload: AssessmentSubmission):
     matches = score_careers(payload)
     summary = {
         "language": payload.language,
         "overview": "Assessment complete. Top matches generated based on interests, skills, and personality alignment.",
         "highlights": [
-            f"Top Career: {matches[0].career}",
-            f"Skill Gap Focus: {', '.join(matches[0].skill_gap[:5]) if matches[0].skill_gap else 'Minimal'}",
+            f"Top Career: {matches[0]['career']}",
+            f"Skill Gap Focus: {', '.join(matches[0]['skill_gap'][:5]) if matches[0]['skill_gap'] else 'Minimal'}",
             "Steady market demand with positive 6M trend",
         ],
     }
-    create_document("assessmentsubmission", payload)
-    return AssessmentResult(matches=matches, preview_summary=summary)
+    await create_document("assessmentsubmission", payload)
+    return ORJSONResponse({"matches": matches, "preview_summary": summary})
 
 
 # ---- Roadmap ----
-@app.post("/api/roadmap", response_model=Roadmap)
-def generate_roadmap(data: Dict[str, Any]):
+
+# Career templates change only through the admin upsert, which invalidates its entry.
+# Bounded LRU; misses are only cached for built-in careers since keys come from clients.
+TEMPLATE_TTL_SECONDS = 300
+TEMPLATE_CACHE_SIZE = 256
+_template_cache: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+
+
+async def get_template(career: str) -> Optional[Dict[str, Any]]:
+    cached = _template_cache.get(career) if isinstance(career, str) else None
+    if cached:
+        if time.monotonic() - cached[0] < TEMPLATE_TTL_SECONDS:
+            _template_cache.move_to_end(career)
+            return cached[1]
+        del _template_cache[career]
+    db = database.db
+    template = await db["careertemplate"].find_one({"career": career}) if db is not None else None
+    if isinstance(career, str) and (template is not None or career in CAREER_LIBRARY):
+        _template_cache[career] = (time.monotonic(), template)
+        if len(_template_cache) > TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+    return template
+
+
+# Fallback roadmap for careers without a stored template; shared, never mutated
+DEFAULT_ROADMAP: Dict[str, List[str]] = {
+    "Classes 8–10": ["Math foundations", "Intro to CS", "Logic puzzles", "Build small projects"],
+    "Classes 11–12": ["Choose PCM", "Python + DSA basics", "Hackathons", "Git + GitHub"],
+    "Graduation": ["Data Structures & Algorithms", "Internship", "System Design basics", "Open Source"],
+    "Certifications": ["Coursera Specialization", "AWS Cloud Practitioner", "Security basics"],
+    "Portfolio": ["3-5 polished projects", "README docs", "Case studies", "Personal website"],
+}
+DEFAULT_ACTIONS: List[str] = ["Complete DSA 150", "Build 2 real-world projects", "Internship hunt", "Leetcode 100"]
+
+
+@app.post("/api/roadmap", response_model=None, responses={200: {"model": Roadmap}})
+async def generate_roadmap(data: Dict[str, Any]):
     career = data.get("career", "Software Engineer")
-    template = db["careertemplate"].find_one({"career": career}) if db else None
+    if not isinstance(career, str):
+        raise HTTPException(status_code=422, detail="career must be a string")
+    template = await get_template(career)
 
     if template:
-        required = template.get("required_skills", [])
-        roadmap = template.get("roadmap", {})
-        summary = template.get("summary", f"Roadmap for {career}")
-        actions = template.get("default_actions", [])
+        # Template fields come from Mongo unchecked, so only this branch is validated
+        content = Roadmap(
+            career=career,
+            summary=template.get("summary", f"Roadmap for {career}"),
+            required_skills=template.get("required_skills", []),
+            roadmap=template.get("roadmap", {}),
+            actions=template.get("default_actions", []),
+        ).model_dump()
     else:
-        required = CAREER_LIBRARY.get(career, CAREER_LIBRARY["Software Engineer"]) ["skills"]
-        roadmap = {
-            "Classes 8–10": ["Math foundations", "Intro to CS", "Logic puzzles", "Build small projects"],
-            "Classes 11–12": ["Choose PCM", "Python + DSA basics", "Hackathons", "Git + GitHub"],
-            "Graduation": ["Data Structures & Algorithms", "Internship", "System Design basics", "Open Source"],
-            "Certifications": ["Coursera Specialization", "AWS Cloud Practitioner", "Security basics"],
-            "Portfolio": ["3-5 polished projects", "README docs", "Case studies", "Personal website"],
+        content = {
+            "career": career,
+            "summary": f"A clear, stage-wise pathway to become a {career}.",
+            "required_skills": CAREER_LIBRARY.get(career, CAREER_LIBRARY["Software Engineer"]).skills,
+            "roadmap": DEFAULT_ROADMAP,
+            "actions": DEFAULT_ACTIONS,
         }
-        summary = f"A clear, stage-wise pathway to become a {career}."
-        actions = ["Complete DSA 150", "Build 2 real-world projects", "Internship hunt", "Leetcode 100"]
-
-    return Roadmap(career=career, summary=summary, required_skills=required, roadmap=roadmap, actions=actions)
+    return ORJSONResponse(content)
 
 
 # ---- PDF ----
-@app.post("/api/pdf")
-def create_pdf(data: Dict[str, Any]):
-    if not REPORTLAB_AVAILABLE:
-        raise HTTPException(status_code=500, detail="PDF engine not available on server")
 
-    career = data.get("career", "Career Roadmap")
-    language = data.get("language", "en")
-    roadmap: Dict[str, List[str]] = data.get("roadmap", {})
-    summary: str = data.get("summary", "")
+# Rendering is CPU-bound, so it runs on the threadpool with bounded concurrency
+# (app.state.pdf_semaphore is created in startup)
+PDF_CONCURRENCY = int(os.getenv("PDF_CONCURRENCY", "4"))
+PDF_SPOOL_MAX_BYTES = 256 * 1024
+PDF_CHUNK_BYTES = 64 * 1024
+
 
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
+@lru_cache(maxsize=None)
+def pdf_engine() -> Optional[SimpleNamespace]:
+    """Import ReportLab on first use and derive the page layout; None if not installed"""
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.units import cm
+    except Exception:
+        return None
+    # Roadmap PDF layout, in points
+    return SimpleNamespace(
+        canvas=canvas,
+        pagesize=A4,
+        left_x=2*cm,
+        bullet_x=2.5*cm,
+        header_y=A4[1] - 2*cm,
+        summary_y=A4[1] - 3.2*cm,
+        content_y=A4[1] - 5*cm,
+        top_y=A4[1] - 3*cm,
+        section_break_y=4*cm,
+        page_break_y=3*cm,
+        section_dy=0.6*cm,
+        section_gap=0.4*cm,
+        line_dy=0.5*cm,
+    )
+
+
+def _render_pdf(buffer, career: str, language: str, roadmap: Dict[str, List[str]], summary: str):
+    pdf = pdf_engine()
+    left_x, top_y, page_break_y, line_dy = pdf.left_x, pdf.top_y, pdf.page_break_y, pdf.line_dy
+    c = pdf.canvas.Canvas(buffer, pagesize=pdf.pagesize)
 
     # Header
     c.setFillColorRGB(0.14, 0.29, 1)
     c.setFont("Helvetica-Bold", 18)
-    c.drawString(2*cm, height - 2*cm, f"Pathify AI — {career} Roadmap ({'English' if language=='en' else 'Hindi'})")
+    c.drawString(left_x, pdf.header_y, f"Pathify AI — {career} Roadmap ({'English' if language=='en' else 'Hindi'})")
 
     c.setFillColorRGB(0,0,0)
     c.setFont("Helvetica", 11)
-    text = c.beginText(2*cm, height - 3.2*cm)
+    text = c.beginText(left_x, pdf.summary_y)
     text.textLines(summary[:600])
     c.drawText(text)
 
-    y = height - 5*cm
+    y = pdf.content_y
     for section, items in roadmap.items():
-        if y < 4*cm:
-            c.showPage(); y = height - 3*cm
+        if y < pdf.section_break_y:
+            c.showPage(); y = top_y
         c.setFont("Helvetica-Bold", 13)
         c.setFillColorRGB(0.26, 0.56, 0.44)  # green tint
-        c.drawString(2*cm, y, section)
-        y -= 0.6*cm
-        c.setFont("Helvetica", 11)
+        c.drawString(left_x, y, section)
+        y -= pdf.section_dy
         c.setFillColorRGB(0,0,0)
-        for it in items:
-            if y < 3*cm:
-                c.showPage(); y = height - 3*cm
-            c.drawString(2.5*cm, y, f"• {it}")
-            y -= 0.5*cm
-        y -= 0.4*cm
+        # One text object per run of bullets that fits above the page break
+        i = 0
+        while i < len(items):
+            if y < page_break_y:
+                c.showPage(); y = top_y
+            run = items[i:i + int((y - page_break_y) // line_dy) + 1]
+            text = c.beginText(pdf.bullet_x, y)
+            text.setFont("Helvetica", 11)
+            text.setLeading(line_dy)
+            for it in run:
+                text.textLine(f"• {it}")
+            c.drawText(text)
+            y -= len(run) * line_dy
+            i += len(run)
+        y -= pdf.section_gap
 
     c.showPage()
     c.save()
     buffer.seek(0)
+
+
+def _iter_file(f):
+    try:
+        while chunk := f.read(PDF_CHUNK_BYTES):
+            yield chunk
+    finally:
+        f.close()
+
+
+@app.post("/api/pdf")
+async def create_pdf(data: Dict[str, Any]):
+    if pdf_engine() is None:
+        raise HTTPException(status_code=500, detail="PDF engine not available on server")
+
+    career = data.get("career", "Career Roadmap")
+    language = data.get("language", "en")
+    roadmap: Dict[str, List[str]] = data.get("roadmap", {})
+    summary: str = data.get("summary", "")
+
+    # Small PDFs stay in memory, large ones spill to disk
+    buffer = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES)
+    try:
+        async with app.state.pdf_semaphore:
+            await run_in_threadpool(_render_pdf, buffer, career, language, roadmap, summary)
+    except Exception:
+        buffer.close()
+        raise
     headers = {"Content-Disposition": f"attachment; filename={career.replace(' ', '_')}_roadmap.pdf"}
-    return StreamingResponse(buffer, media_type="application/pdf", headers=headers)
+    return StreamingResponse(_iter_file(buffer), media_type="application/pdf", headers=headers)
 
 
 # ---- Admin minimal ----
 @app.post("/api/admin/templates")
-def upsert_template(tpl: CareerTemplate):
-    db["careertemplate"].update_one({"career": tpl.career}, {"$set": tpl.model_dump()}, upsert=True)
+async def upsert_template(tpl: CareerTemplate):
+    await database.db["careertemplate"].update_one({"career": tpl.career}, {"$set": tpl.model_dump()}, upsert=True)
+    _template_cache.pop(tpl.career, None)
     return {"ok": True}
 
 @app.get("/api/admin/templates")
-def list_templates():
+async def list_templates():
     return [
         {"career": d.get("career"), "summary": d.get("summary")}
-        for d in get_documents("careertemplate")
+        for d in await get_documents("careertemplate")
     ]
 
 
 # ---- Dashboards ----
 @app.get("/api/student/{email}/overview")
-def student_overview(email: str):
-    saved = list(db["careertemplate"].find({}, {"career": 1, "_id": 0}))[:5] if db else []
+async def student_overview(email: str):
+    db = database.db
+    saved = await db["careertemplate"].find({}, {"career": 1, "_id": 0}).to_list(length=5) if db is not None else []
     tasks = [
         {"title": "Complete DSA 50", "done": False},
         {"title": "Publish 1 project", "done": True},
@@ -353,7 +730,7 @@ def student_overview(email: str):
 
 
 @app.get("/api/parent/{email}/overview")
-def parent_overview(email: str):
+async def parent_overview(email: str):
     return {
         "student": email,
         "recommended": ["Software Engineer", "Data Scientist"],
@@ -366,7 +743,7 @@ def parent_overview(email: str):
 
 
 @app.get("/schema")
-def schema_list():
+async def schema_list():
     # For viewers/tools to introspect schemas
     return {
         "collections": [
@@ -378,4 +755,13 @@ def schema_list():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Workers need an import string; each one builds its own lookup tables at import.
+    # "auto" picks uvloop/httptools when uvicorn[standard] installed them.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", "2")),
+    )
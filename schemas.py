@@ -11,8 +11,8 @@ Model name is converted to lowercase for the collection name:
 - BlogPost -> "blogs" collection
 """
 
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, EmailStr, conint, conlist, field_validator
+from typing import Optional, List, Dict, Any, Tuple
 
 # Core user types
 class User(BaseModel):
@@ -34,13 +34,19 @@ class ContactMessage(BaseModel):
 
 class AssessmentSubmission(BaseModel):
     academic_performance: str
-    interests: List[str]
-    skills: List[str]
+    interests: Tuple[str, ...]
+    skills: Tuple[str, ...]
     preferences: List[str]
-    personality_answers: List[int] = Field(..., description="Array of 10–15 integers 1–5")
+    personality_answers: conlist(conint(ge=1, le=5), min_length=10, max_length=15) = Field(..., description="Array of 10–15 integers 1–5")
     uploaded_docs: Optional[List[str]] = Field(default=None, description="Filenames uploaded")
     language: str = Field("en", description="en | hi")
 
+    @field_validator("interests", "skills", mode="after")
+    @classmethod
+    def casefold_tags(cls, v: Tuple[str, ...]) -> Tuple[str, ...]:
+        # Normalized once here so scoring can compare without lowercasing
+        return tuple(s.casefold() for s in v)
+
 class CareerMatch(BaseModel):
     career: str
     match_percent: int
@@ -15,5 +15,11 @@ mkdir -p logs
 echo "Installing dependencies..."
 pip install -r requirements.txt
 echo "Starting FastAPI server..."
-nohup uvicorn main:app --host 0.0.0.0 --port 8000 --reload > logs/server.log 2>&1 
+# Reloads on edits by default; set WEB_CONCURRENCY to run that many workers
+# instead (--reload only supports a single process)
+if [ -n "$WEB_CONCURRENCY" ]; then
+  nohup uvicorn main:app --host 0.0.0.0 --port 8000 --workers "$WEB_CONCURRENCY" > logs/server.log 2>&1 
+else
+  nohup uvicorn main:app --host 0.0.0.0 --port 8000 --reload > logs/server.log 2>&1 
+fi
 echo "Server started in background"